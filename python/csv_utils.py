@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Utilidades compartidas por los scripts de análisis y gráficas: lectura de los CSV
+de resultados y CPUs disponibles para leerlos en paralelo (sin dependencias de Java).
+"""
+
+import os
+from functools import lru_cache
+
+TAIL_BYTES = 4096  # bloque final que alcanza para varias filas de cualquiera de los CSV
+
+
+def cpu_ids():
+    """CPUs realmente asignadas al proceso (afinidad/cgroup), no todas las del host."""
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:  # sin sched_getaffinity (macOS, Windows)
+        return list(range(os.cpu_count() or 1))
+
+
+def available_cpus():
+    """Cantidad de CPUs asignadas al proceso (ver cpu_ids)."""
+    return len(cpu_ids())
+
+
+# Hilos para leer CSV en paralelo (I/O): más allá de unos pocos no se gana nada
+IO_WORKERS = min(8, available_cpus())
+
+
+@lru_cache(maxsize=16)
+def _header_index(header_line, column):
+    """Índice de la columna en una línea de header; todos los CSV comparten esquema."""
+    header = header_line.decode("utf-8").strip().split(",")
+    return header.index(column) if column in header else None
+
+
+def col_index(column, csv_path):
+    """Índice de la columna en el header del CSV (None si no está)."""
+    with open(csv_path, "rb") as f:
+        header_line = f.readline()
+    return _header_index(header_line, column)
+
+
+def load_hv(csv_path):
+    """Vector de HV del CSV (None si no tiene la columna 'Hypervolume')."""
+    import numpy as np  # solo aquí: read_last_row también se usa desde scripts sin numpy
+
+    hv_col = col_index("Hypervolume", csv_path)
+    if hv_col is None:
+        return None
+    return np.loadtxt(csv_path, delimiter=",", skiprows=1, usecols=hv_col, ndmin=1)
+
+
+def read_last_row(csv_path, tail_bytes=TAIL_BYTES):
+    """Devuelve (header, última fila) leyendo solo el final del archivo."""
+    with open(csv_path, "rb") as f:
+        header = f.readline().decode("utf-8").strip().split(",")
+        data_start = f.tell()
+        size = f.seek(0, os.SEEK_END)
+        offset = max(data_start, size - tail_bytes)
+        f.seek(offset)
+        lines = [line for line in f.read().splitlines() if line.strip()]
+
+        # La primera línea del bloque puede estar cortada: si es la única, leer todo
+        if offset > data_start and len(lines) < 2:
+            f.seek(data_start)
+            lines = [line for line in f.read().splitlines() if line.strip()]
+
+    if not lines:
+        raise RuntimeError(f"Sin datos en {csv_path}")
+
+    return header, lines[-1].decode("utf-8").split(",")
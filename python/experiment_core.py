@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Funciones compartidas por los scripts que lanzan experimentos NSGA-II:
+compilación única, JVM persistente (MainLoop) y nombres de los archivos de salida.
+"""
+
+import subprocess
+import os
+import itertools
+import shutil
+import threading
+import queue
+from decimal import Decimal
+
+from csv_utils import available_cpus, cpu_ids
+
+OUTPUT_DIR = "output"
+
+# Compilación única: clases compiladas + classpath de dependencias resuelto por Maven
+CLASSES_DIR = "target/classes"
+CLASSPATH_FILE = os.path.join(OUTPUT_DIR, ".cp")
+CLASSPATH = None  # se completa en prepare_classpath()
+DONE_SENTINEL = b"DONE "  # línea que MainLoop imprime al terminar cada ejecución
+STDERR_MARKER = b"--- MainLoop: fin de ejecucion ---"  # MainLoop.STDERR_MARKER (con --stderr-marker)
+STDERR_HEAD_LINES = 20  # primeras líneas de stderr que se conservan por ejecución para diagnosticar errores
+
+
+def available_memory():
+    """Memoria disponible en bytes (MemAvailable de /proc/meminfo; None si no se puede saber)."""
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+# Cada JVM usa más de un hilo (NSGA-II + GC/JIT): repartir las CPUs entre JVMs
+JAVA_THREADS_PER_WORKER = 2
+# Heap máximo por JVM y memoria reservada por worker (heap + metaspace, JIT y pilas)
+JAVA_MAX_HEAP = "1g"
+JAVA_MEMORY_PER_WORKER = 2 * 1024 ** 3
+
+MAX_WORKERS = max(1, available_cpus() // JAVA_THREADS_PER_WORKER)
+_memory = available_memory()
+if _memory is not None:
+    # Sin memoria para todas las JVM, más workers solo agregan swapping
+    MAX_WORKERS = max(1, min(MAX_WORKERS, _memory // JAVA_MEMORY_PER_WORKER))
+
+
+def run_command(command, description):
+    """Ejecuta un comando y muestra su salida."""
+    print(f"\n{'='*70}")
+    print(f"Ejecutando: {description}")
+    print(f"Comando: {' '.join(command)}")
+    print(f"{'='*70}\n")
+    
+    # Salida heredada de la terminal (sin capturar en memoria) y sin stdin:
+    # Maven nunca queda bloqueado esperando entrada o con el pipe lleno
+    returncode = subprocess.call(command, stdin=subprocess.DEVNULL)
+    if returncode != 0:
+        print(f"\n✗ Error al ejecutar: {description}")
+        print(f"Código de salida: {returncode}\n")
+        return False
+    print(f"\n✓ {description} completado exitosamente\n")
+    return True
+
+
+def prepare_classpath():
+    """
+    Compila el proyecto una sola vez y obtiene el classpath de dependencias,
+    para lanzar cada experimento con `java` directamente en lugar de `mvn exec:java`.
+    """
+    global CLASSPATH
+    os.makedirs(os.path.dirname(CLASSPATH_FILE), exist_ok=True)
+    command = [
+        "mvn",
+        "-q",
+        "compile",
+        "dependency:build-classpath",
+        f"-Dmdep.outputFile={CLASSPATH_FILE}",
+    ]
+    if not run_command(command, "Compilación y classpath de dependencias (Maven)"):
+        return False
+
+    with open(CLASSPATH_FILE, 'r', encoding='utf-8') as f:
+        CLASSPATH = CLASSES_DIR + os.pathsep + f.read().strip()
+    return True
+
+
+def worker_cpu_sets(num_workers):
+    """
+    Reparte las CPUs disponibles en `num_workers` conjuntos disjuntos (formato de taskset -c),
+    para que cada JVM trabaje siempre sobre los mismos núcleos y no comparta caché con otra.
+    """
+    cpus = cpu_ids()
+    per_worker = max(1, len(cpus) // num_workers)
+    cpu_sets = []
+    for i in range(num_workers):
+        # Con menos CPUs que workers los conjuntos se repiten en forma circular
+        start = (i * per_worker) % len(cpus)
+        cpu_sets.append(",".join(str(cpu) for cpu in cpus[start:start + per_worker]))
+    return cpu_sets
+
+
+class JavaDriver:
+    """
+    JVM persistente (com.university.MainLoop) que ejecuta un experimento por cada
+    línea de argumentos escrita en su stdin y responde con "DONE <rc> [error]".
+    Con `cpus` (p. ej. "0,1") la JVM queda fijada a esos núcleos vía taskset.
+    Con `capture_stderr` el stderr no va a la terminal: de cada ejecución solo se
+    guardan sus primeras líneas en `stderr_head`.
+    Tras cada ejecución `last_error` tiene el mensaje de la excepción informado por
+    MainLoop (None si no hubo o si la JVM murió sin responder).
+    """
+
+    def __init__(self, cpus=None, capture_stderr=False):
+        self.cpus = cpus
+        self.capture_stderr = capture_stderr
+        self.stderr_head = []
+        self.last_error = None
+        self.completed = False  # la última ejecución terminó con "DONE" (no por muerte de la JVM)
+        self._start()
+
+    def _start(self):
+        """Lanza la JVM (también para reemplazar una que terminó)."""
+        command = ["java", f"-Xmx{JAVA_MAX_HEAP}", "-cp", CLASSPATH, "com.university.MainLoop"]
+        if self.capture_stderr:
+            command.append("--stderr-marker")
+        if self.cpus and shutil.which("taskset"):
+            # GC y JIT dimensionan sus hilos según las CPUs fijadas, no las del host
+            command[1:1] = [f"-XX:ActiveProcessorCount={len(self.cpus.split(','))}"]
+            command = ["taskset", "-c", self.cpus] + command
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE if self.capture_stderr else None
+        )
+        # Una cola por JVM: el lector deja en ella el stderr de cada ejecución terminada
+        self._stderr_runs = queue.Queue()
+        if self.capture_stderr:
+            # Hilo lector: vacía el pipe para que la JVM nunca se bloquee escribiendo en stderr
+            threading.Thread(target=self._read_stderr, args=(self.proc.stderr, self._stderr_runs),
+                             daemon=True).start()
+
+    @staticmethod
+    def _read_stderr(stderr, runs):
+        """
+        Separa el stderr de la JVM por ejecución (hasta cada STDERR_MARKER) y deja en `runs`
+        las primeras STDERR_HEAD_LINES líneas de cada una; al cerrarse el pipe (la JVM murió)
+        deja también las de la ejecución en curso.
+        """
+        head = []
+        for line in stderr:
+            if line.rstrip(b"\r\n") == STDERR_MARKER:
+                runs.put(head)
+                head = []
+            elif len(head) < STDERR_HEAD_LINES:
+                head.append(line)
+        runs.put(head)
+
+    def _restart(self):
+        """Descarta la JVM que terminó (timeout, OOM, crash) y lanza una nueva."""
+        self.proc.wait()
+        for pipe in (self.proc.stdin, self.proc.stdout):
+            try:
+                pipe.close()
+            except OSError:  # stdin de un proceso muerto: el flush pendiente falla
+                pass
+        self._start()
+
+    def _send(self, line):
+        self.proc.stdin.write(line)
+        self.proc.stdin.flush()
+
+    def run_one(self, *args, on_line=None):
+        """
+        Envía una ejecución y reenvía su salida hasta el centinela; devuelve el código de salida.
+        Con `on_line` cada línea (bytes, sin decodificar) se pasa a esa función en lugar de imprimirse.
+        Si la JVM terminó en una ejecución anterior, se relanza antes de enviar esta.
+        """
+        self.completed = False
+        self.last_error = None
+        self.stderr_head = []
+        request = (" ".join(str(arg) for arg in args) + "\n").encode("utf-8")
+        if self.proc.poll() is not None:
+            self._restart()
+        try:
+            self._send(request)
+        except BrokenPipeError:
+            # Terminó entre poll() y la escritura
+            self._restart()
+            self._send(request)
+        for line in self.proc.stdout:
+            if line.startswith(DONE_SENTINEL):
+                self.completed = True
+                _, returncode, *error = line.split(None, 2)
+                if error:
+                    self.last_error = error[0].decode("utf-8", errors="replace").strip()
+                self._collect_stderr()
+                return int(returncode)
+            if on_line is None:
+                # Solo se decodifica lo que se muestra por pantalla
+                print(line.decode("utf-8", errors="replace"), end="")
+            else:
+                on_line(line)
+        # stdout cerrado sin centinela: la JVM terminó (se relanza en la próxima ejecución)
+        returncode = self.proc.wait() or 1
+        self._collect_stderr()
+        return returncode
+
+    def _collect_stderr(self):
+        """
+        Espera a que el lector entregue el stderr de la ejecución que acaba de terminar
+        (MainLoop escribe el marcador antes de "DONE"; si la JVM murió, el pipe se cierra).
+        """
+        if self.capture_stderr:
+            self.stderr_head = self._stderr_runs.get()
+
+    def close(self):
+        """Cierra stdin para que MainLoop termine y espera a la JVM."""
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+            self.proc.wait()
+
+
+def _prob_digits(prob):
+    """
+    Dígitos de una probabilidad sin el punto decimal (0.1 -> "01", 0.001 -> "0001",
+    0.75 -> "075", 1.0 -> "10", 1e-7 -> "00000001"). Parte del repr del float, que es
+    el decimal más corto que lo representa: no redondea ni pierde decimales.
+    """
+    return format(Decimal(repr(float(prob))), "f").replace(".", "")
+
+
+def run_id(population_size, mutation_prob, crossover_prob):
+    """
+    Identificador de la combinación, también usado por Java en sus archivos de salida.
+    Formato: 50_01_06
+    - 50 = tamaño de población
+    - 01 = probabilidad de mutación (0.1 -> 01, 0.01 -> 001, 0.001 -> 0001)
+    - 06 = probabilidad de cruzamiento (0.6 -> 06, 0.7 -> 07, 0.8 -> 08)
+    """
+    return f"{population_size}_{_prob_digits(mutation_prob)}_{_prob_digits(crossover_prob)}"
+
+
+def generate_output_filename(population_size, mutation_prob, crossover_prob, prefix="evolucion_nsga2"):
+    """
+    Genera un nombre de archivo único basado en los parámetros.
+    Formato: evolucion_nsga2_50_01_06.png (ver run_id)
+    """
+    return f"{OUTPUT_DIR}/{prefix}_{run_id(population_size, mutation_prob, crossover_prob)}.png"
+
+
+def build_combinations(instances, population_sizes, crossover_probs, mutation_probs):
+    """Lista plana de combinaciones (instancia, población, cruzamiento, mutación); las más costosas primero."""
+    configs = list(itertools.product(instances, population_sizes, crossover_probs, mutation_probs))
+    # Java nombra sus salidas con run_id: dos combinaciones con el mismo id se pisarían
+    ids = {(instance, run_id(pop, mut, cx)) for instance, pop, cx, mut in configs}
+    if len(ids) != len(configs):
+        raise ValueError("Hay combinaciones distintas con el mismo identificador de ejecución")
+    configs.sort(key=lambda config: -config[1])
+    return configs
+
+
+def merge_run_outputs(instance_name, run_ids):
+    """
+    Junta los archivos que Java escribió por ejecución (con runId) en los acumulados de la
+    instancia que escribe sin runId, como si las ejecuciones hubieran sido en serie:
+    - frente de Pareto y estadísticas de hipervolumen: se agregan en el orden de `run_ids`
+      (header solo si el acumulado es nuevo; PARETO_FILE apunta al frente acumulado)
+    - asignaciones greedy/NSGA-II: quedan las de la última ejecución de `run_ids`
+    Los archivos por ejecución se eliminan; los de evolución siguen siendo uno por ejecución.
+    """
+    base = f"{OUTPUT_DIR}/{instance_name}"
+    pareto_path = f"{base}_pareto_front.csv"
+    for kind in ("pareto_front", "hypervolume_stats"):
+        merged_path = f"{base}_{kind}.csv"
+        write_header = not os.path.exists(merged_path)
+        with open(merged_path, "a", encoding="utf-8") as merged:
+            for rid in run_ids:
+                run_path = f"{base}_{kind}_{rid}.csv"
+                if not os.path.exists(run_path):  # ejecución fallida o sin frente
+                    continue
+                with open(run_path, "r", encoding="utf-8") as f:
+                    header = f.readline()
+                    if write_header:
+                        merged.write(header)
+                        write_header = False
+                    for line in f:
+                        if kind == "hypervolume_stats":
+                            line = line.rstrip("\r\n").rsplit(",", 1)[0] + "," + pareto_path + "\n"
+                        merged.write(line)
+                os.remove(run_path)
+
+    for solver in ("greedy", "nsga2"):
+        run_paths = [path for path in (f"{base}_{solver}_{rid}_asignaciones.csv" for rid in run_ids)
+                     if os.path.exists(path)]
+        if run_paths:
+            os.replace(run_paths[-1], f"{base}_{solver}_asignaciones.csv")
+            for path in run_paths[:-1]:
+                os.remove(path)
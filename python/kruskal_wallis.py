@@ -1,7 +1,9 @@
 import os
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from scipy.stats import kruskal
 
+from csv_utils import IO_WORKERS, load_hv
+
 # ===============================
 # Configuración
 # ===============================
@@ -18,8 +20,7 @@ population_sizes = ["50", "100", "200"]
 # Cargar datos
 # ===============================
 
-groups = []
-group_names = []
+pending = []
 
 for pc in p_cruzamientos:
     for pm in p_mutaciones:
@@ -32,20 +33,27 @@ for pc in p_cruzamientos:
                 print(f"[WARN] CSV no encontrado: {csv_path}")
                 continue
 
-            df = pd.read_csv(csv_path)
+            pending.append((dir_name, csv_path))
 
-            if "Hypervolume" not in df.columns:
-                print(f"[ERROR] Columna 'Hypervolume' no encontrada en {csv_path}")
-                continue
+# Lectura en paralelo (I/O); map() conserva el orden de las configuraciones
+with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+    hv_arrays = list(executor.map(load_hv, [csv_path for _, csv_path in pending]))
 
-            hv = df["Hypervolume"].values
+groups = []
+group_names = []
 
-            if len(hv) == 0:
-                print(f"[WARN] Sin datos en {dir_name}")
-                continue
+for (dir_name, csv_path), hv in zip(pending, hv_arrays):
+
+    if hv is None:
+        print(f"[ERROR] Columna 'Hypervolume' no encontrada en {csv_path}")
+        continue
+
+    if len(hv) == 0:
+        print(f"[WARN] Sin datos en {dir_name}")
+        continue
 
-            groups.append(hv)
-            group_names.append(dir_name)
+    groups.append(hv)
+    group_names.append(dir_name)
 
 # ===============================
 # Validación mínima
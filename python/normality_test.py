@@ -1,8 +1,11 @@
 
+import hashlib
 import os
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from scipy import stats
 
+from csv_utils import IO_WORKERS, load_hv
+
 # ===============================
 # Configuración
 # ===============================
@@ -16,6 +19,25 @@ p_cruzamientos = ["06", "07", "08"]
 p_mutaciones = ["1", "01", "001"]
 population_sizes = ["50", "100", "200"]
 
+SHAPIRO_MAX_N = 5000  # por encima, Shapiro-Wilk pierde precisión en el p-value
+
+
+_normality_cache = {}
+
+
+def _normality_test(hv):
+    """
+    Shapiro-Wilk (o D'Agostino-Pearson si n > SHAPIRO_MAX_N), cacheado por
+    contenido para no repetir el test en configuraciones con los mismos datos.
+    """
+    key = hashlib.blake2b(hv.tobytes(), digest_size=16).digest()
+    if key not in _normality_cache:
+        if len(hv) <= SHAPIRO_MAX_N:
+            _normality_cache[key] = stats.shapiro(hv)
+        else:
+            _normality_cache[key] = stats.normaltest(hv)
+    return _normality_cache[key]
+
 # ===============================
 # Resultados globales
 # ===============================
@@ -28,6 +50,8 @@ results = []
 # Recorrido de directorios
 # ===============================
 
+pending = []
+
 for pc in p_cruzamientos:
     for pm in p_mutaciones:
         for pop in population_sizes:
@@ -44,40 +68,43 @@ for pc in p_cruzamientos:
                 print(f"[WARN] CSV no encontrado en: {dir_name}")
                 continue
 
-            # ===============================
-            # Leer CSV y extraer HV
-            # ===============================
+            pending.append((dir_name, csv_path))
 
-            df = pd.read_csv(csv_path)
+# ===============================
+# Leer CSVs y extraer HV (en paralelo, es I/O)
+# ===============================
 
-            if "Hypervolume" not in df.columns:
-                print(f"[ERROR] Columna 'Hypervolume' no encontrada en {csv_path}")
-                continue
+with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+    hv_arrays = list(executor.map(load_hv, [csv_path for _, csv_path in pending]))
+
+for (dir_name, csv_path), hv in zip(pending, hv_arrays):
 
-            hv = df["Hypervolume"].values
+    if hv is None:
+        print(f"[ERROR] Columna 'Hypervolume' no encontrada en {csv_path}")
+        continue
 
-            # ===============================
-            # Test de normalidad (Shapiro-Wilk)
-            # ===============================
+    # ===============================
+    # Test de normalidad (Shapiro-Wilk)
+    # ===============================
 
-            stat, p_value = stats.shapiro(hv)
+    stat, p_value = _normality_test(hv)
 
-            is_normal = p_value >= ALPHA
+    is_normal = p_value >= ALPHA
 
-            if is_normal:
-                normal_count += 1
-                result_str = "NORMAL"
-            else:
-                not_normal_count += 1
-                result_str = "NO NORMAL"
+    if is_normal:
+        normal_count += 1
+        result_str = "NORMAL"
+    else:
+        not_normal_count += 1
+        result_str = "NO NORMAL"
 
-            results.append({
-                "config": dir_name,
-                "p_value": p_value,
-                "result": result_str
-            })
+    results.append({
+        "config": dir_name,
+        "p_value": p_value,
+        "result": result_str
+    })
 
-            print(f"{dir_name:35s} -> {result_str} (p-value = {p_value:.5f})")
+    print(f"{dir_name:35s} -> {result_str} (p-value = {p_value:.5f})")
 
 # ===============================
 # Decisión final por mayoría
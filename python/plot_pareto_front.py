@@ -5,12 +5,20 @@ Script para graficar el frente de Pareto del algoritmo NSGA-II
 Adaptado para el proyecto de asignación de salones
 """
 
-import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Backend sin interfaz gráfica: solo se guardan PNG
 import numpy as np
 import matplotlib.pyplot as plt
 import os
 import glob
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from csv_utils import IO_WORKERS
+
+# Frente aproximado que genera este script; no es una entrada
+APPROXIMATED_FRONT_CSV = 'output/approximated_pareto_front.csv'
+
 
 # Function to check if a solution dominates another
 def dominates(solution_a, solution_b):
@@ -25,12 +33,12 @@ def dominates(solution_a, solution_b):
     # - f1_a <= f1_b (same or fewer assignments)
     # - f2_a >= f2_b (same or better separation)
     # - At least one is strictly better
-    f1_better = solution_a[0] <= solution_b[0]
-    f2_better = solution_a[1] >= solution_b[1]
-    f1_strictly_better = solution_a[0] < solution_b[0]
-    f2_strictly_better = solution_a[1] > solution_b[1]
-    
-    return (f1_better and f2_better) and (f1_strictly_better or f2_strictly_better)
+    # Salir apenas un objetivo descarta la dominancia (f1 primero: su rango es mayor)
+    if solution_a[0] > solution_b[0]:
+        return False
+    if solution_a[1] < solution_b[1]:
+        return False
+    return solution_a[0] < solution_b[0] or solution_a[1] > solution_b[1]
 
 
 # Function to get non-dominated solutions
@@ -38,24 +46,52 @@ def get_non_dominated_solutions(solutions):
     """
     Encuentra todas las soluciones no dominadas (frente de Pareto).
     Retorna también las soluciones dominadas.
+    Las no dominadas se retornan ordenadas por f1 ascendente.
     """
-    non_dominated = []
-    dominated = []
-    dominated_indices = []
-    
-    for i, sol_a in enumerate(solutions):
-        is_dominated = False
-        for j, sol_b in enumerate(solutions):
-            if i != j and dominates(sol_b, sol_a):  # If sol_b dominates sol_a
-                is_dominated = True
-                break
-        if is_dominated:
-            dominated.append(sol_a)
-            dominated_indices.append(i)
-        else:
-            non_dominated.append(sol_a)
-    
-    return np.array(non_dominated), np.array(dominated)
+    solutions = np.asarray(solutions, dtype=float).reshape(-1, 2)
+    n = len(solutions)
+    if n == 0:
+        return solutions.copy(), solutions.copy()
+
+    # Barrido 2D: ordenar por f1 ascendente y, a igual f1, por f2 descendente.
+    # Así todo posible dominador de un punto aparece antes que él en el orden.
+    order = np.lexsort((-solutions[:, 1], solutions[:, 0]))
+    f1 = solutions[order, 0]
+    f2 = solutions[order, 1]
+
+    # Grupos de igual f1: solo el máximo f2 del grupo (y sus duplicados) puede
+    # ser no dominado, y además debe superar estrictamente a todo punto con menor f1
+    group_start = np.ones(n, dtype=bool)
+    group_start[1:] = f1[1:] != f1[:-1]
+    starts = np.flatnonzero(group_start)
+    group_id = np.cumsum(group_start) - 1
+
+    running_max = np.maximum.accumulate(f2)
+    best_before = np.full(len(starts), -np.inf)
+    best_before[1:] = running_max[starts[1:] - 1]
+
+    on_front = (f2 == f2[starts][group_id]) & (f2 > best_before[group_id])
+
+    dominated_mask = np.empty(n, dtype=bool)
+    dominated_mask[order] = ~on_front
+
+    # El frente sale ya ordenado por f1 gracias al barrido
+    return solutions[order[on_front]], solutions[dominated_mask]
+
+
+def _read_f1f2(file):
+    """
+    Lee las columnas f1 y f2 de un CSV como array (n, 2).
+    Retorna None si el archivo no tiene ambas columnas.
+    """
+    with open(file, 'r', encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+    if 'f1' not in header or 'f2' not in header:
+        return None
+    # Parsear solo las columnas de objetivos, directo a un array (n, 2)
+    return np.loadtxt(file, delimiter=',', skiprows=1,
+                      usecols=(header.index('f1'), header.index('f2')),
+                      ndmin=2)
 
 
 # Read all Pareto front files and combine them
@@ -63,21 +99,25 @@ def combine_pareto_fronts(file_list):
     """
     Lee múltiples archivos CSV y combina todas las soluciones.
     """
-    all_solutions = []
-    
-    # Read each file and add the solutions to the list
+    existing_files = []
     for file in file_list:
         if os.path.exists(file):
-            df = pd.read_csv(file)
-            # Asegurarse de que tiene las columnas correctas
-            if 'f1' in df.columns and 'f2' in df.columns:
-                solutions = df[['f1', 'f2']].values
-                all_solutions.append(solutions)
-            else:
-                print(f"Advertencia: {file} no tiene las columnas 'f1' y 'f2'")
+            existing_files.append(file)
         else:
             print(f"Advertencia: {file} no existe")
     
+    # Read the files in parallel (I/O bound); map() keeps the order of file_list
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        arrays = list(executor.map(_read_f1f2, existing_files))
+    
+    all_solutions = []
+    for file, solutions in zip(existing_files, arrays):
+        # Asegurarse de que tiene las columnas correctas
+        if solutions is not None:
+            all_solutions.append(solutions)
+        else:
+            print(f"Advertencia: {file} no tiene las columnas 'f1' y 'f2'")
+    
     if not all_solutions:
         raise ValueError("No se encontraron archivos válidos con soluciones")
     
@@ -87,6 +127,30 @@ def combine_pareto_fronts(file_list):
     return all_solutions
 
 
+def _find_fun_csvs(root='.'):
+    """
+    Busca recursivamente archivos FUN*.csv bajo root con os.scandir.
+    Equivale a glob('**/FUN*.csv', recursive=True) (omite directorios ocultos)
+    pero usa el tipo cacheado de cada DirEntry en lugar de un stat por entrada.
+    """
+    found = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.startswith('FUN') and entry.name.endswith('.csv'):
+                        found.append(os.path.normpath(entry.path))
+        except OSError:
+            continue
+    return found
+
+
 def plot_pareto_front(solutions, non_dominated, dominated, output_file='output/pareto_front.png'):
     """
     Grafica el frente de Pareto mostrando tanto soluciones dominadas como no dominadas.
@@ -102,16 +166,13 @@ def plot_pareto_front(solutions, non_dominated, dominated, output_file='output/p
     
     # Plot non-dominated solutions (frente de Pareto) on top
     if len(non_dominated) > 0:
-        # Sort by f1 for better visualization
-        sorted_indices = np.argsort(non_dominated[:, 0])
-        sorted_pareto = non_dominated[sorted_indices]
-        
+        # get_non_dominated_solutions already returns the front sorted by f1
         # Draw line connecting Pareto front points
-        plt.plot(sorted_pareto[:, 0], sorted_pareto[:, 1], 
+        plt.plot(non_dominated[:, 0], non_dominated[:, 1], 
                 'r-', linewidth=2.5, alpha=0.8, label='Frente de Pareto', zorder=3)
         
         # Plot non-dominated points
-        plt.scatter(sorted_pareto[:, 0], sorted_pareto[:, 1], 
+        plt.scatter(non_dominated[:, 0], non_dominated[:, 1], 
                    c='red', s=100, alpha=0.9, 
                    label=f'Soluciones no dominadas ({len(non_dominated)})',
                    edgecolors='darkred', linewidths=2, zorder=5, marker='o')
@@ -131,10 +192,53 @@ def plot_pareto_front(solutions, non_dominated, dominated, output_file='output/p
     
     plt.savefig(output_file, dpi=200, bbox_inches='tight')
     print(f'\n✓ Gráfica guardada en: {output_file}')
-    # plt.show()  # Comentado para ejecución batch (descomentar para visualización interactiva)
     plt.close()  # Cerrar la figura para liberar memoria
 
 
+def render(pareto_front_files, output_file='output/pareto_front.png'):
+    """
+    Combina los frentes de los archivos indicados, guarda el frente aproximado
+    y genera la gráfica. Se puede llamar en el mismo proceso (run_experiments.py).
+    """
+    # Combinar todas las soluciones
+    print("\nLeyendo soluciones...")
+    combined_pareto = combine_pareto_fronts(pareto_front_files)
+    print(f"Total de soluciones leídas: {len(combined_pareto)}")
+    
+    # Encontrar soluciones no dominadas y dominadas
+    print("\nCalculando frente de Pareto (soluciones no dominadas)...")
+    non_dominated, dominated = get_non_dominated_solutions(combined_pareto)
+    print(f"Soluciones no dominadas encontradas: {len(non_dominated)}")
+    print(f"Soluciones dominadas encontradas: {len(dominated)}")
+    
+    # Mostrar estadísticas
+    if len(non_dominated) > 0:
+        print("\nEstadísticas del frente de Pareto (no dominadas):")
+        print(f"  f1 (Asignaciones): min={non_dominated[:, 0].min():.2f}, max={non_dominated[:, 0].max():.2f}")
+        print(f"  f2 (Separación):   min={non_dominated[:, 1].min():.2f}, max={non_dominated[:, 1].max():.2f}")
+    
+    if len(dominated) > 0:
+        print("\nEstadísticas de soluciones dominadas:")
+        print(f"  f1 (Asignaciones): min={dominated[:, 0].min():.2f}, max={dominated[:, 0].max():.2f}")
+        print(f"  f2 (Separación):   min={dominated[:, 1].min():.2f}, max={dominated[:, 1].max():.2f}")
+    
+    # Guardar frente de Pareto aproximado
+    # Mismo formato que los CSV de frente de Pareto que escribe Java (%.6f)
+    output_csv = APPROXIMATED_FRONT_CSV
+    np.savetxt(output_csv, non_dominated, fmt='%.6f', delimiter=',', header='f1,f2', comments='')
+    print(f"\n✓ Frente de Pareto aproximado guardado en: {output_csv}")
+    
+    # Guardar también las soluciones dominadas si se desea
+    if len(dominated) > 0:
+        dominated_csv = 'output/dominated_solutions.csv'
+        np.savetxt(dominated_csv, dominated, fmt='%.6f', delimiter=',', header='f1,f2', comments='')
+        print(f"✓ Soluciones dominadas guardadas en: {dominated_csv}")
+    
+    # Graficar
+    print("\nGenerando gráfica...")
+    plot_pareto_front(combined_pareto, non_dominated, dominated, output_file)
+
+
 def main():
     """
     Función principal.
@@ -148,15 +252,19 @@ def main():
         pareto_front_files = [input_file]
     else:
         # Opción 2: Buscar archivos en el directorio output/
-        # Buscar archivos que coincidan con el patrón *_pareto_front.csv
-        pareto_front_files = glob.glob('output/*_pareto_front.csv')
+        # Buscar archivos que coincidan con el patrón *_pareto_front*.csv
+        # (también los de cada ejecución, {instancia}_pareto_front_{run_id}.csv)
+        pareto_front_files = sorted(
+            f for f in glob.glob('output/*_pareto_front*.csv')
+            if os.path.normpath(f) != os.path.normpath(APPROXIMATED_FRONT_CSV)
+        )
         
         # Si no se encuentran, buscar cualquier archivo FUN*.csv (formato del código original)
         if not pareto_front_files:
             pareto_front_files = glob.glob('output/FUN*.csv')
             if not pareto_front_files:
                 # Buscar en subdirectorios
-                pareto_front_files = glob.glob('**/FUN*.csv', recursive=True)
+                pareto_front_files = _find_fun_csvs()
         
         # Si aún no se encuentran, usar un archivo por defecto
         if not pareto_front_files:
@@ -173,50 +281,13 @@ def main():
     for f in pareto_front_files:
         print(f"  - {f}")
     
-    # Combinar todas las soluciones
-    print("\nLeyendo soluciones...")
-    combined_pareto = combine_pareto_fronts(pareto_front_files)
-    print(f"Total de soluciones leídas: {len(combined_pareto)}")
-    
-    # Encontrar soluciones no dominadas y dominadas
-    print("\nCalculando frente de Pareto (soluciones no dominadas)...")
-    non_dominated, dominated = get_non_dominated_solutions(combined_pareto)
-    print(f"Soluciones no dominadas encontradas: {len(non_dominated)}")
-    print(f"Soluciones dominadas encontradas: {len(dominated)}")
-    
-    # Mostrar estadísticas
-    if len(non_dominated) > 0:
-        print("\nEstadísticas del frente de Pareto (no dominadas):")
-        print(f"  f1 (Asignaciones): min={non_dominated[:, 0].min():.2f}, max={non_dominated[:, 0].max():.2f}")
-        print(f"  f2 (Separación):   min={non_dominated[:, 1].min():.2f}, max={non_dominated[:, 1].max():.2f}")
-    
-    if len(dominated) > 0:
-        print("\nEstadísticas de soluciones dominadas:")
-        print(f"  f1 (Asignaciones): min={dominated[:, 0].min():.2f}, max={dominated[:, 0].max():.2f}")
-        print(f"  f2 (Separación):   min={dominated[:, 1].min():.2f}, max={dominated[:, 1].max():.2f}")
-    
-    # Guardar frente de Pareto aproximado
-    non_dominated_df = pd.DataFrame(non_dominated, columns=['f1', 'f2'])
-    output_csv = 'output/approximated_pareto_front.csv'
-    non_dominated_df.to_csv(output_csv, index=False)
-    print(f"\n✓ Frente de Pareto aproximado guardado en: {output_csv}")
-    
-    # Guardar también las soluciones dominadas si se desea
-    if len(dominated) > 0:
-        dominated_df = pd.DataFrame(dominated, columns=['f1', 'f2'])
-        dominated_csv = 'output/dominated_solutions.csv'
-        dominated_df.to_csv(dominated_csv, index=False)
-        print(f"✓ Soluciones dominadas guardadas en: {dominated_csv}")
-    
     # Obtener nombre de archivo de salida (opcional, segundo argumento)
     if len(sys.argv) > 2:
         output_file = sys.argv[2]
     else:
         output_file = 'output/pareto_front.png'
     
-    # Graficar
-    print("\nGenerando gráfica...")
-    plot_pareto_front(combined_pareto, non_dominated, dominated, output_file)
+    render(pareto_front_files, output_file)
 
 
 if __name__ == '__main__':
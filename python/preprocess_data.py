@@ -11,11 +11,22 @@ Este script:
 
 import csv
 import json
+import multiprocessing
 import os
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Set, Tuple
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, FrozenSet, List, Tuple
+
+from csv_utils import available_cpus
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa json de la biblioteca estándar
+    orjson = None
 
 # Configuración de rutas
 BASE_DIR = Path(__file__).parent.parent.parent.parent
@@ -23,53 +34,69 @@ RESOURCES_DIR = BASE_DIR / "src" / "main" / "resources"
 DATASETS_DIR = RESOURCES_DIR / "datasets"
 OUTPUT_DIR = RESOURCES_DIR / "processed"
 
+# Un cambio en este script invalida todos los JSON generados
+SCRIPT_MTIME_NS = os.stat(__file__).st_mtime_ns
 
-def normalize_carrera(carrera: str) -> Set[str]:
-    """Normaliza y separa las carreras de un string."""
-    if not carrera or carrera.strip() == '':
-        return set()
-    
-    # Separar por ; o ,
-    carreras = re.split(r'[;,]', carrera.lower())
-    # Limpiar espacios y normalizar
-    carreras = {c.strip() for c in carreras if c.strip()}
-    
-    # Normalización de nombres de carrera
-    normalization_map = {
-        'todas': 'todas',
-        'computacion': 'computacion',
-        'computación': 'computacion',
-        'electronica': 'electronica',
-        'electrónica': 'electronica',
-        'electrica': 'electrica',
-        'eléctrica': 'electrica',
-        'civil': 'civil',
-        'mecanica': 'mecanica',
-        'mecánica': 'mecanica',
-        'mecania': 'mecanica',  # typo en datos
-        'produccion': 'produccion',
-        'producción': 'produccion',
-        'quimica': 'quimica',
-        'química': 'quimica',
-        'alimentos': 'alimentos',
-        'naval': 'naval',
-        'agrimensura': 'agrimensura',
-        'sistemas de comunicacion': 'sistemas_comunicacion',
-        'sistemas de comunicación': 'sistemas_comunicacion',
-        'tecnologo telecomunicacione': 'tecnologo_telecom',
-        'tecnologo telecomunicaciones': 'tecnologo_telecom',
-    }
+
+# Normalización de nombres de carrera
+CARRERA_NORMALIZATION_MAP = {
+    'todas': 'todas',
+    'computacion': 'computacion',
+    'computación': 'computacion',
+    'electronica': 'electronica',
+    'electrónica': 'electronica',
+    'electrica': 'electrica',
+    'eléctrica': 'electrica',
+    'civil': 'civil',
+    'mecanica': 'mecanica',
+    'mecánica': 'mecanica',
+    'mecania': 'mecanica',  # typo en datos
+    'produccion': 'produccion',
+    'producción': 'produccion',
+    'quimica': 'quimica',
+    'química': 'quimica',
+    'alimentos': 'alimentos',
+    'naval': 'naval',
+    'agrimensura': 'agrimensura',
+    'sistemas de comunicacion': 'sistemas_comunicacion',
+    'sistemas de comunicación': 'sistemas_comunicacion',
+    'tecnologo telecomunicacione': 'tecnologo_telecom',
+    'tecnologo telecomunicaciones': 'tecnologo_telecom',
+}
+# Nombres internados: el vocabulario es chico y se repite en todas las filas
+CARRERA_NORMALIZATION_MAP = {k: sys.intern(v) for k, v in CARRERA_NORMALIZATION_MAP.items()}
+
+_CARRERA_SPLIT = re.compile(r'[;,]')
+
+
+@lru_cache(maxsize=4096)
+def normalize_carrera(carrera: str) -> FrozenSet[str]:
+    """
+    Normaliza y separa las carreras de un string.
     
-    normalized = set()
-    for c in carreras:
-        c_lower = c.lower().strip()
-        if c_lower in normalization_map:
-            normalized.add(normalization_map[c_lower])
-        elif c_lower:
-            # Si no está en el mapa, usar tal cual
-            normalized.add(c_lower.replace(' ', '_'))
+    Memoizada: el mismo string de carreras se repite en muchas filas, por eso
+    devuelve un frozenset (inmutable, seguro de compartir entre llamadas).
+    """
+    if not carrera or carrera.strip() == '':
+        return frozenset()
     
-    return normalized
+    # Separar por ; o , y limpiar espacios; las claves del mapa ya están en minúscula.
+    # Si no está en el mapa, usar tal cual (espacios como '_')
+    return frozenset(
+        CARRERA_NORMALIZATION_MAP.get(c) or sys.intern(c.replace(' ', '_'))
+        for c in (x.strip() for x in _CARRERA_SPLIT.split(carrera.lower()))
+        if c
+    )
+
+
+def write_json(path: Path, data) -> None:
+    """Escribe data como JSON indentado (2 espacios) en UTF-8, con orjson si está disponible."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
 
 
 def load_salones(filepath: Path) -> List[Dict]:
@@ -160,9 +187,9 @@ def load_examenes(filepath: Path, instance_name: str) -> List[Dict]:
     return examenes
 
 
-def calculate_conflict_groups(examenes: List[Dict]) -> Dict[str, List[int]]:
+def build_conflict_structures(examenes: List[Dict]) -> Tuple[Dict[str, List[int]], List[List[int]]]:
     """
-    Calcula grupos de conflicto basados en semestre y carrera.
+    Calcula los grupos de conflicto y los pares en conflicto en una sola pasada.
     
     Dos exámenes están en conflicto si:
     - Pertenecen al mismo semestre Y
@@ -170,6 +197,8 @@ def calculate_conflict_groups(examenes: List[Dict]) -> Dict[str, List[int]]:
     
     Si una materia tiene 'todas', se agrega a todas las carreras del semestre.
     Si no hay carreras específicas en el semestre, se crea un grupo especial para 'todas'.
+    
+    Devuelve (conflict_groups, conflict_pairs), con los pares [i, j] (i < j) ordenados.
     """
     # Primero, recopilar todas las carreras únicas por semestre (excluyendo 'todas')
     semestre_carreras = defaultdict(set)
@@ -187,104 +216,36 @@ def calculate_conflict_groups(examenes: List[Dict]) -> Dict[str, List[int]]:
             semestre = exam['semestre']
             carreras = set(exam['carreras'])
             
-            # Si tiene 'todas', expandir a todas las carreras del semestre
+            # Si tiene 'todas', expandir a todas las carreras del semestre;
+            # si no hay carreras específicas, usar un grupo especial para 'todas'
             if 'todas' in carreras:
-                if semestre_carreras[semestre]:
-                    # Agregar a todas las carreras del semestre
-                    for carrera in semestre_carreras[semestre]:
-                        key = f"{semestre}_{carrera}"
-                        semestre_carrera_index[key].append(exam['id'])
-                else:
-                    # Si no hay carreras específicas, crear grupo especial para 'todas'
-                    key = f"{semestre}_todas"
-                    semestre_carrera_index[key].append(exam['id'])
+                expanded = semestre_carreras[semestre] or {'todas'}
             else:
-                # Agregar a las carreras específicas
-                for carrera in carreras:
-                    if carrera:  # Ignorar strings vacíos
-                        key = f"{semestre}_{carrera}"
-                        semestre_carrera_index[key].append(exam['id'])
-    
-    return dict(semestre_carrera_index)
-
-
-def calculate_conflict_matrix(examenes: List[Dict]) -> List[List[int]]:
-    """
-    Genera una matriz de adyacencia de conflictos.
-    conflict_matrix[i][j] = 1 si examen i y j están en conflicto
-    
-    Dos exámenes están en conflicto si:
-    - Pertenecen al mismo semestre Y
-    - Comparten al menos una carrera (o alguno tiene 'todas')
-    """
-    n = len(examenes)
-    matrix = [[0] * n for _ in range(n)]
-    
-    # Primero, recopilar todas las carreras únicas por semestre (excluyendo 'todas')
-    semestre_carreras = defaultdict(set)
-    for exam in examenes:
-        if exam['semestre'] > 0:
-            for carrera in exam['carreras']:
-                if carrera and carrera != 'todas':
-                    semestre_carreras[exam['semestre']].add(carrera)
+                expanded = {carrera for carrera in carreras if carrera}  # Ignorar strings vacíos
+            
+            for carrera in expanded:
+                semestre_carrera_index[f"{semestre}_{carrera}"].append(exam['id'])
     
-    # Expandir 'todas' a todas las carreras del semestre para cada examen
-    examenes_expandidos = []
-    for exam in examenes:
-        carreras_expandidas = set()
-        if exam['semestre'] > 0:
-            if 'todas' in exam['carreras']:
-                # Expandir 'todas' a todas las carreras del semestre
-                carreras_expandidas = semestre_carreras[exam['semestre']].copy()
-                # Si no hay carreras específicas, usar un marcador especial para que 'todas' conflictúen entre sí
-                if not carreras_expandidas:
-                    carreras_expandidas = {'todas'}
-            else:
-                # Usar las carreras específicas
-                carreras_expandidas = {c for c in exam['carreras'] if c and c != 'todas'}
-        examenes_expandidos.append({
-            'id': exam['id'],
-            'semestre': exam['semestre'],
-            'carreras': carreras_expandidas
-        })
+    # Los pares en conflicto son los pares dentro de cada grupo; como los ids de
+    # cada grupo son crecientes, combinations() da (i, j) con i < j
+    edges = set()
+    for exam_ids in semestre_carrera_index.values():
+        edges.update(combinations(exam_ids, 2))
     
-    # Generar matriz de conflictos
-    for i, exam1 in enumerate(examenes_expandidos):
-        for j, exam2 in enumerate(examenes_expandidos):
-            if i >= j:
-                continue
-            
-            # Verificar conflicto: mismo semestre y carrera compartida
-            if exam1['semestre'] > 0 and exam2['semestre'] > 0:
-                if exam1['semestre'] == exam2['semestre']:
-                    carreras1 = exam1['carreras']
-                    carreras2 = exam2['carreras']
-                    
-                    # Hay conflicto si comparten al menos una carrera
-                    if carreras1 & carreras2:  # Intersección no vacía
-                        matrix[i][j] = 1
-                        matrix[j][i] = 1
+    conflict_pairs = [list(pair) for pair in sorted(edges)]
     
-    return matrix
+    return dict(semestre_carrera_index), conflict_pairs
 
 
 def process_instance(instance_file: Path, salones: List[Dict], instance_name: str) -> Dict:
     """Procesa una instancia de exámenes."""
     examenes = load_examenes(instance_file, instance_name)
-    conflict_groups = calculate_conflict_groups(examenes)
-    conflict_matrix = calculate_conflict_matrix(examenes)
+    conflict_groups, conflict_pairs = build_conflict_structures(examenes)
     
     # Calcular estadísticas
     total_inscritos = sum(e['inscritos'] for e in examenes)
     total_aforo = sum(s['aforo'] for s in salones)
     
-    # Calcular pares de conflicto para las funciones objetivo
-    conflict_pairs = []
-    for i in range(len(examenes)):
-        for j in range(i + 1, len(examenes)):
-            if conflict_matrix[i][j] == 1:
-                conflict_pairs.append([i, j])
-    
     return {
         'instance_name': instance_name,
         'examenes': examenes,
@@ -303,6 +264,42 @@ def process_instance(instance_file: Path, salones: List[Dict], instance_name: st
     }
 
 
+def cache_key(*inputs: Path) -> List[int]:
+    """Clave de caché: mtime del script más (mtime, tamaño) de cada archivo de entrada."""
+    key = [SCRIPT_MTIME_NS]
+    for path in inputs:
+        st = os.stat(path)
+        key += [st.st_mtime_ns, st.st_size]
+    return key
+
+
+def load_cached_stats(output_file: Path, key: List[int]):
+    """Estadísticas del JSON ya generado si su '_cache_key' coincide; None si hay que reprocesar."""
+    try:
+        with open(output_file, 'rb') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data['stats'] if data.get('_cache_key') == key else None
+
+
+_worker_salones = None
+
+
+def _init_worker(salones: List[Dict]) -> None:
+    """Inicializador del pool: los salones se envían una vez por proceso, no por tarea."""
+    global _worker_salones
+    _worker_salones = salones
+
+
+def process_instance_worker(filepath: Path, instance_name: str, key: List[int]) -> Dict:
+    """Procesa una instancia y guarda su JSON en el worker; devuelve solo las estadísticas."""
+    data = process_instance(filepath, _worker_salones, instance_name)
+    data['_cache_key'] = key
+    write_json(OUTPUT_DIR / f"{instance_name}.json", data)
+    return data['stats']
+
+
 def main():
     """Función principal de preprocesamiento."""
     # Crear directorio de salida
@@ -316,8 +313,7 @@ def main():
     print(f"Aforo total: {sum(s['aforo'] for s in salones)}")
     
     # Guardar salones procesados
-    with open(OUTPUT_DIR / "salones.json", 'w', encoding='utf-8') as f:
-        json.dump(salones, f, indent=2, ensure_ascii=False)
+    write_json(OUTPUT_DIR / "salones.json", salones)
     
     # Procesar cada instancia
     instances = [
@@ -327,35 +323,41 @@ def main():
         ("inscritos_examenes_2024-inst4.csv", "promedio_2024"),
     ]
     
-    all_instances = {}
-    
+    # Se omiten las instancias cuyo JSON ya está al día (mismas entradas y mismo script)
+    summary = {}
+    pending = []
     for filename, instance_name in instances:
         filepath = DATASETS_DIR / filename
         if filepath.exists():
-            print(f"\nProcesando {instance_name}...")
-            data = process_instance(filepath, salones, instance_name)
-            all_instances[instance_name] = data
-            
-            # Guardar instancia individual
-            output_file = OUTPUT_DIR / f"{instance_name}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            print(f"  Exámenes: {data['stats']['num_examenes']}")
-            print(f"  Pares en conflicto: {data['stats']['num_conflict_pairs']}")
-            print(f"  Total inscritos: {data['stats']['total_inscritos']}")
-            print(f"  Max inscritos: {data['stats']['max_inscritos']}")
+            key = cache_key(filepath, salones_file)
+            stats = load_cached_stats(OUTPUT_DIR / f"{instance_name}.json", key)
+            if stats is None:
+                pending.append((filepath, instance_name, key))
+            summary[instance_name] = stats
         else:
             print(f"Archivo no encontrado: {filepath}")
     
-    # Guardar resumen de todas las instancias
-    summary = {
-        instance_name: data['stats'] 
-        for instance_name, data in all_instances.items()
-    }
+    # Las instancias son independientes: se procesan en paralelo y cada worker
+    # guarda su propio JSON (solo vuelven las estadísticas, no los datos completos)
+    if pending:
+        num_workers = min(len(pending), available_cpus())
+        with multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(salones,)) as pool:
+            all_stats = pool.starmap(process_instance_worker, pending)
+        
+        for (_, instance_name, _), stats in zip(pending, all_stats):
+            summary[instance_name] = stats
+    
+    processed = {instance_name for _, instance_name, _ in pending}
+    for instance_name, stats in summary.items():
+        cached = "" if instance_name in processed else " (sin cambios)"
+        print(f"\nInstancia {instance_name}{cached}:")
+        print(f"  Exámenes: {stats['num_examenes']}")
+        print(f"  Pares en conflicto: {stats['num_conflict_pairs']}")
+        print(f"  Total inscritos: {stats['total_inscritos']}")
+        print(f"  Max inscritos: {stats['max_inscritos']}")
     
-    with open(OUTPUT_DIR / "summary.json", 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+    # Guardar resumen de todas las instancias
+    write_json(OUTPUT_DIR / "summary.json", summary)
     
     print("\n" + "="*50)
     print("Preprocesamiento completado!")
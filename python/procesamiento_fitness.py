@@ -1,8 +1,9 @@
-import pandas as pd
 import numpy as np
 import re
 from pathlib import Path
 
+from csv_utils import read_last_row
+
 # ===== CONFIGURACIÓN =====
 BASE_DIR = Path("output/diciembre2024_08_001_100/")   # ← acá apuntás al directorio
 CSV_REGEX = re.compile(r"diciembre_2024_evolucion_.*\.csv")
@@ -22,13 +23,11 @@ def collect_best_fitness(base_dir: Path):
         raise RuntimeError("No se encontraron CSVs que matcheen la regex")
 
     for csv in csv_files:
-        df = pd.read_csv(csv)
-
         # Última generación
-        last_gen = df.iloc[-1]
+        header, last_gen = read_last_row(csv)
 
-        obj1.append(last_gen["mejor_fitness_obj1"])
-        obj2.append(last_gen["mejor_fitness_obj2"])
+        obj1.append(float(last_gen[header.index("mejor_fitness_obj1")]))
+        obj2.append(float(last_gen[header.index("mejor_fitness_obj2")]))
 
     return np.array(obj1), np.array(obj2)
 
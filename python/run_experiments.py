@@ -5,133 +5,112 @@ Script para ejecutar múltiples experimentos con diferentes configuraciones
 del algoritmo NSGA-II y generar gráficas después de cada ejecución.
 """
 
-import subprocess
 import os
-import glob
+import queue
+import threading
 import sys
 from pathlib import Path
 
+from experiment_core import (
+    OUTPUT_DIR,
+    JavaDriver,
+    build_combinations,
+    generate_output_filename,
+    merge_run_outputs,
+    prepare_classpath,
+    run_id,
+)
+
+# Gráficas en el mismo proceso: matplotlib se importa una sola vez para todo el barrido
+from plot_evolucion import render as render_evolucion
+from plot_pareto_front import render as render_pareto_front
+
 # Configuración de parámetros
 POPULATION_SIZES = [50, 100, 200]
 CROSSOVER_PROBABILITIES = [0.6, 0.7, 0.8]
 MUTATION_PROBABILITIES = [0.1, 0.01, 0.001]
 INSTANCE_FILES = ["promedio_2024"]  # Por ahora solo un archivo
 
-# Rutas de scripts
-PLOT_EVOLUCION_SCRIPT = "output/plot_evolucion.py"
-PLOT_PARETO_SCRIPT = "plot_pareto_front.py"
-OUTPUT_DIR = "output"
+
+def run_java_main(driver, instance_name, population_size, crossover_prob, mutation_prob):
+    """
+    Ejecuta el programa Java Main con los parámetros especificados.
+    Se pasa "-" como semilla y el identificador de la combinación, para que Java
+    escriba sus CSV con nombres fijos en lugar de marca de tiempo.
+    """
+    description = (f"Java Main - Instancia: {instance_name}, Población: {population_size}, "
+                   f"Cruzamiento: {crossover_prob}, Mutación: {mutation_prob}")
+    print(f"\n{'='*70}")
+    print(f"Ejecutando: {description}")
+    print(f"{'='*70}\n")
+
+    # La misma JVM (ya calentada) atiende todas las combinaciones
+    returncode = driver.run_one(instance_name, population_size, crossover_prob, mutation_prob,
+                                "-", run_id(population_size, mutation_prob, crossover_prob))
+    if returncode == 0:
+        print(f"\n✓ {description} completado exitosamente\n")
+        return True
+    print(f"\n✗ Error al ejecutar: {description}")
+    print(f"Código de salida: {returncode}\n")
+    return False
 
 
-def run_command(command, description):
-    """Ejecuta un comando y muestra su salida."""
+def run_plot(render, args, description):
+    """Ejecuta una función de graficado en el mismo proceso y muestra el resultado."""
     print(f"\n{'='*70}")
     print(f"Ejecutando: {description}")
-    print(f"Comando: {' '.join(command)}")
     print(f"{'='*70}\n")
     
     try:
-        result = subprocess.run(
-            command,
-            check=True,
-            capture_output=False,
-            text=True
-        )
+        render(*args)
         print(f"\n✓ {description} completado exitosamente\n")
         return True
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"\n✗ Error al ejecutar: {description}")
-        print(f"Código de salida: {e.returncode}\n")
+        print(f"Error: {e}\n")
         return False
 
 
-def find_latest_file(pattern):
-    """Encuentra el archivo más reciente que coincide con el patrón."""
-    files = glob.glob(pattern)
-    if not files:
-        return None
-    # Ordenar por tiempo de modificación (más reciente primero)
-    files.sort(key=os.path.getmtime, reverse=True)
-    return files[0]
-
-
-
-
-def run_java_main(instance_name, population_size, crossover_prob, mutation_prob):
-    """Ejecuta el programa Java Main con los parámetros especificados."""
-    # Usar Maven para ejecutar el programa Java
-    command = [
-        "mvn",
-        "compile",
-        "exec:java",
-        "-Dexec.mainClass=com.university.Main",
-        "-Dexec.args=" + f"{instance_name} {population_size} {crossover_prob} {mutation_prob}",
-        "-q"  # Modo silencioso para reducir output
-    ]
-    
-    return run_command(command, f"Java Main - Instancia: {instance_name}, Población: {population_size}, "
-                                f"Cruzamiento: {crossover_prob}, Mutación: {mutation_prob}")
-
-
-def generate_output_filename(population_size, mutation_prob, crossover_prob, prefix="evolucion_nsga2"):
-    """
-    Genera un nombre de archivo único basado en los parámetros.
-    Formato: evolucion_nsga2_50_01_06.png
-    - 50 = tamaño de población
-    - 01 = probabilidad de mutación (0.1 -> 01, 0.01 -> 001, 0.001 -> 0001)
-    - 06 = probabilidad de cruzamiento (0.6 -> 06, 0.7 -> 07, 0.8 -> 08)
-    """
-    # Convertir probabilidad de mutación a string sin punto, manteniendo ceros
-    # 0.1 -> "01", 0.01 -> "001", 0.001 -> "0001"
-    mut_str = str(mutation_prob).replace('.', '')
-    # Si no tiene ceros a la izquierda, agregar uno (0.1 -> "1" -> "01")
-    if len(mut_str) == 1:
-        mut_str = "0" + mut_str
-    
-    # Convertir probabilidad de cruzamiento a string sin punto
-    # 0.6 -> "06", 0.7 -> "07", 0.8 -> "08"
-    cross_str = str(int(crossover_prob * 10))
-    if len(cross_str) == 1:
-        cross_str = "0" + cross_str
-    
-    return f"{OUTPUT_DIR}/{prefix}_{population_size}_{mut_str}_{cross_str}.png"
-
-
 def run_plot_scripts(instance_name, population_size, crossover_prob, mutation_prob):
-    """Ejecuta los scripts de gráficas después de una ejecución."""
+    """Genera las gráficas de evolución y de frente de Pareto después de una ejecución."""
     # Generar nombres únicos para los archivos de salida
     evolucion_output = generate_output_filename(population_size, mutation_prob, crossover_prob, "evolucion_nsga2")
     pareto_output = generate_output_filename(population_size, mutation_prob, crossover_prob, "pareto_front")
     
-    # Encontrar el archivo CSV de evolución más reciente
-    evolucion_pattern = f"{OUTPUT_DIR}/{instance_name}_evolucion_*.csv"
-    evolucion_csv = find_latest_file(evolucion_pattern)
+    # Java nombra sus CSV con el identificador de la combinación: no hace falta buscarlos
+    combination_id = run_id(population_size, mutation_prob, crossover_prob)
+    evolucion_csv = f"{OUTPUT_DIR}/{instance_name}_evolucion_{combination_id}.csv"
     
-    if not evolucion_csv:
+    if not os.path.isfile(evolucion_csv):
         print(f"Advertencia: No se encontró archivo de evolución para {instance_name}")
     else:
         print(f"Archivo de evolución encontrado: {evolucion_csv}")
-        # Ejecutar plot_evolucion.py con el archivo CSV y nombre de salida
-        run_command(
-            ["python3", PLOT_EVOLUCION_SCRIPT, evolucion_csv, evolucion_output],
+        run_plot(
+            render_evolucion, (evolucion_csv, evolucion_output),
             f"Generando gráfica de evolución para {instance_name}"
         )
     
-    # Encontrar el archivo CSV del frente de Pareto más reciente
-    pareto_pattern = f"{OUTPUT_DIR}/{instance_name}_pareto_front.csv"
-    pareto_csv = find_latest_file(pareto_pattern)
+    pareto_csv = f"{OUTPUT_DIR}/{instance_name}_pareto_front_{combination_id}.csv"
     
-    if not pareto_csv:
+    if not os.path.isfile(pareto_csv):
         print(f"Advertencia: No se encontró archivo de frente de Pareto para {instance_name}")
     else:
         print(f"Archivo de frente de Pareto encontrado: {pareto_csv}")
-        # Ejecutar plot_pareto_front.py con el archivo específico y nombre de salida
-        run_command(
-            ["python3", PLOT_PARETO_SCRIPT, pareto_csv, pareto_output],
+        run_plot(
+            render_pareto_front, ([pareto_csv], pareto_output),
             f"Generando gráfica de frente de Pareto para {instance_name}"
         )
 
 
+def plot_worker(plot_queue):
+    """
+    Consume las combinaciones terminadas y genera sus gráficas mientras Java
+    ejecuta la siguiente. Un único hilo: matplotlib (pyplot) no es thread-safe.
+    """
+    while (job := plot_queue.get()) is not None:
+        run_plot_scripts(*job)
+
+
 def main():
     """Función principal que ejecuta todos los experimentos."""
     print("╔════════════════════════════════════════════════════════════╗")
@@ -145,48 +124,64 @@ def main():
     print(f"  - Archivos de instancia: {INSTANCE_FILES}")
     print()
     
-    total_combinations = len(POPULATION_SIZES) * len(CROSSOVER_PROBABILITIES) * \
-                        len(MUTATION_PROBABILITIES) * len(INSTANCE_FILES)
+    # Lista plana de combinaciones; las poblaciones grandes (más costosas) primero
+    configs = build_combinations(INSTANCE_FILES, POPULATION_SIZES,
+                                 CROSSOVER_PROBABILITIES, MUTATION_PROBABILITIES)
+    total_combinations = len(configs)
     print(f"Total de combinaciones a ejecutar: {total_combinations}")
     print()
     
     # Asegurar que el directorio output existe
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
-    combination_count = 0
+    # Compilar una sola vez antes de todas las combinaciones
+    if not prepare_classpath():
+        print("✗ No se pudo compilar el proyecto ni obtener el classpath")
+        sys.exit(1)
+    
     successful = 0
     failed = 0
     
+    driver = JavaDriver()
+    
+    # Las gráficas se generan en segundo plano, solapadas con la siguiente ejecución de Java
+    plot_queue = queue.Queue()
+    plotter = threading.Thread(target=plot_worker, args=(plot_queue,), daemon=True)
+    plotter.start()
+    
     # Iterar sobre todas las combinaciones
-    for instance_file in INSTANCE_FILES:
-        for pop_size in POPULATION_SIZES:
-            for crossover_prob in CROSSOVER_PROBABILITIES:
-                for mutation_prob in MUTATION_PROBABILITIES:
-                    combination_count += 1
-                    
-                    print(f"\n{'#'*70}")
-                    print(f"# COMBINACIÓN {combination_count}/{total_combinations}")
-                    print(f"# Instancia: {instance_file}")
-                    print(f"# Población: {pop_size}")
-                    print(f"# Cruzamiento: {crossover_prob}")
-                    print(f"# Mutación: {mutation_prob}")
-                    print(f"{'#'*70}\n")
-                    
-                    # Ejecutar Java Main
-                    if run_java_main(instance_file, pop_size, crossover_prob, mutation_prob):
-                        successful += 1
-                        
-                        # Ejecutar scripts de gráficas
-                        print(f"\n{'='*70}")
-                        print(f"Generando gráficas para combinación {combination_count}...")
-                        print(f"{'='*70}\n")
-                        
-                        run_plot_scripts(instance_file, pop_size, crossover_prob, mutation_prob)
-                        
-                        print(f"\n✓ Combinación {combination_count} completada exitosamente\n")
-                    else:
-                        failed += 1
-                        print(f"\n✗ Combinación {combination_count} falló\n")
+    try:
+        for combination_count, (instance_file, pop_size, crossover_prob, mutation_prob) in enumerate(configs, 1):
+            print(f"\n{'#'*70}")
+            print(f"# COMBINACIÓN {combination_count}/{total_combinations}")
+            print(f"# Instancia: {instance_file}")
+            print(f"# Población: {pop_size}")
+            print(f"# Cruzamiento: {crossover_prob}")
+            print(f"# Mutación: {mutation_prob}")
+            print(f"{'#'*70}\n")
+        
+            # Ejecutar Java Main
+            if run_java_main(driver, instance_file, pop_size, crossover_prob, mutation_prob):
+                successful += 1
+            
+                # Encolar las gráficas y pasar directamente a la siguiente combinación
+                plot_queue.put((instance_file, pop_size, crossover_prob, mutation_prob))
+            
+                print(f"\n✓ Combinación {combination_count} completada exitosamente "
+                      f"(gráficas en cola)\n")
+            else:
+                failed += 1
+                print(f"\n✗ Combinación {combination_count} falló\n")
+    finally:
+        driver.close()
+        # Esperar a que se terminen las gráficas pendientes
+        plot_queue.put(None)
+        plotter.join()
+        # Con las gráficas listas, juntar frentes, estadísticas y asignaciones de cada
+        # combinación en los archivos de la instancia, en el orden en que se ejecutaron
+        for instance_file in INSTANCE_FILES:
+            merge_run_outputs(instance_file, [run_id(pop, mut, cx)
+                                              for inst, pop, cx, mut in configs if inst == instance_file])
     
     # Resumen final
     print("\n" + "="*70)
@@ -11,28 +11,45 @@ Este script:
 4. Permite verificar si los hipervolúmenes siguen una distribución normal
 """
 
-import subprocess
 import csv
 import sys
+import queue
+import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from operator import itemgetter
 import re
 import os
 
+from csv_utils import read_last_row
+from experiment_core import MAX_WORKERS, JavaDriver, merge_run_outputs, prepare_classpath, worker_cpu_sets
+
 OUTPUT_DIR = Path("output")
 NUM_REPLICATES = 30
 INSTANCE_NAME = "febrero_2024"
 POPULATION_SIZE = 100
 CROSSOVER_PROB = 0.8
 MUTATION_PROB = 0.001
+JAVA_TIMEOUT = 600  # Timeout de 10 minutos por ejecución (segundos)
+
+# Patrones del hipervolumen en la salida, en orden de prioridad: un "HV:" suelto solo se
+# usa si no aparece "Hipervolumen calculado:" (que también cubre la variante con "✓").
+# Compilados una vez y en bytes: la salida de Java se analiza sin decodificarla
+HYPERVOLUME_PATTERNS = [
+    re.compile(rb'Hipervolumen calculado:\s*([\d.]+)', re.IGNORECASE),
+    re.compile(rb'hypervolume[:\s]+([\d.]+)', re.IGNORECASE),
+    re.compile(rb'HV[:\s]+([\d.]+)', re.IGNORECASE),
+]
 
 
-def run_java_experiment(seed: int, replicate_num: int, total_replicates: int) -> Optional[float]:
+def run_java_experiment(driver: JavaDriver, seed: int, replicate_num: int,
+                        total_replicates: int) -> Optional[float]:
     """
     Ejecuta una réplica del experimento Java con una semilla específica.
     
     Args:
+        driver: JVM persistente (MainLoop) del worker que atiende la réplica
         seed: Semilla aleatoria para esta ejecución
         replicate_num: Número de réplica actual
         total_replicates: Total de réplicas a ejecutar
@@ -44,37 +61,70 @@ def run_java_experiment(seed: int, replicate_num: int, total_replicates: int) ->
     print(f"RÉPLICA {replicate_num}/{total_replicates} - Semilla: {seed}")
     print(f"{'='*80}\n")
     
-    command = [
-        "mvn",
-        "compile",
-        "exec:java",
-        "-Dexec.mainClass=com.university.Main",
-        "-Dexec.args=" + f"{INSTANCE_NAME} {POPULATION_SIZE} {CROSSOVER_PROB} {MUTATION_PROB} {seed}",
-    ]
+    # Identificador por semilla: cada réplica escribe sus propios CSV (evolución, frente
+    # de Pareto, estadísticas y asignaciones), sin pisarse con las de otros workers
+    run_id = f"seed{seed}"
+    stats_file = OUTPUT_DIR / f"{INSTANCE_NAME}_hypervolume_stats_{run_id}.csv"
+    
+    best_match = None  # (prioridad del patrón, valor) del mejor hipervolumen visto
+    
+    def scan_line(line):
+        # Buscar el hipervolumen en la salida; el resto del log se descarta sin conservarlo.
+        # Solo se prueban patrones de mayor prioridad que el ya encontrado, y tras
+        # encontrar el principal ("✓ Hipervolumen calculado: X.XXXXXX") no se aplica ninguno
+        nonlocal best_match
+        num_patterns = len(HYPERVOLUME_PATTERNS) if best_match is None else best_match[0]
+        found = match_hypervolume(line, num_patterns)
+        if found is not None:
+            best_match = found
     
     try:
-        # Ejecutar el comando y capturar la salida
-        result = subprocess.run(
-            command,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=600  # Timeout de 10 minutos por ejecución
-        )
+        timed_out = threading.Event()
+        finished = threading.Lock()  # tomado al volver run_one: el timer ya no mata la JVM
+        
+        def kill_on_timeout():
+            if finished.acquire(blocking=False):
+                timed_out.set()
+                driver.proc.kill()
         
-        # Buscar el hipervolumen en la salida
-        # El formato es: "✓ Hipervolumen calculado: X.XXXXXX"
-        hypervolume = extract_hypervolume_from_output(result.stdout)
+        started_at = time.time()
+        timer = threading.Timer(JAVA_TIMEOUT, kill_on_timeout)
+        timer.start()
+        try:
+            returncode = driver.run_one(INSTANCE_NAME, POPULATION_SIZE, CROSSOVER_PROB, MUTATION_PROB,
+                                        seed, run_id, on_line=scan_line)
+        finally:
+            finished.acquire(blocking=False)
+            timer.cancel()
         
+        # Timeout solo si la JVM murió sin responder: si llegó "DONE", el resultado vale
+        # aunque el timer haya disparado justo antes de cancelarse
+        if timed_out.is_set() and not driver.completed:
+            print(f"✗ Réplica {replicate_num} excedió el tiempo límite (10 minutos)")
+            return None
+        if returncode != 0:
+            print(f"✗ Error en réplica {replicate_num}: código de salida {returncode}")
+            # Mensaje de la excepción (línea DONE) o, si la JVM murió, el inicio de su stderr
+            if driver.last_error:
+                print(f"  Error: {driver.last_error[:200]}")
+            elif driver.stderr_head:
+                error_log = b"".join(driver.stderr_head).decode("utf-8", errors="replace")
+                print(f"  Error: {error_log[:200]}")
+            return None
+        
+        hypervolume = best_match[1] if best_match is not None else None
         if hypervolume is not None:
             print(f"✓ Réplica {replicate_num} completada - Hipervolumen: {hypervolume:.6f}")
             return hypervolume
         else:
-            # Esperar un momento para que el archivo se escriba
-            time.sleep(1)
+            # Java cierra el CSV antes de responder: esperar (con backoff corto) solo
+            # si todavía no se ve modificado después del inicio de la réplica
+            for delay in (0.02, 0.05, 0.1, 0.2):
+                if stats_file.exists() and stats_file.stat().st_mtime >= started_at:
+                    break
+                time.sleep(delay)
             # Intentar leer del archivo CSV de estadísticas
-            # El número de líneas esperadas es el número de réplicas exitosas + 1 (header)
-            hypervolume = extract_hypervolume_from_csv(replicate_num)
+            hypervolume = extract_hypervolume_from_csv(stats_file)
             if hypervolume is not None:
                 print(f"✓ Réplica {replicate_num} completada - Hipervolumen: {hypervolume:.6f} (desde CSV)")
                 return hypervolume
@@ -82,99 +132,93 @@ def run_java_experiment(seed: int, replicate_num: int, total_replicates: int) ->
                 print(f"⚠ Réplica {replicate_num} completada pero no se encontró hipervolumen")
                 return None
                 
-    except subprocess.TimeoutExpired:
-        print(f"✗ Réplica {replicate_num} excedió el tiempo límite (10 minutos)")
-        return None
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Error en réplica {replicate_num}: código de salida {e.returncode}")
-        if e.stderr:
-            print(f"  Error: {e.stderr[:200]}")
-        return None
     except Exception as e:
         print(f"✗ Error inesperado en réplica {replicate_num}: {e}")
         return None
 
 
-def extract_hypervolume_from_output(output: str) -> Optional[float]:
+def match_hypervolume(output: bytes, num_patterns: int) -> Optional[Tuple[int, float]]:
     """
-    Extrae el valor del hipervolumen de la salida del programa Java.
-    
-    Busca líneas como:
-    - "✓ Hipervolumen calculado: 32.592000"
-    - "Hipervolumen calculado: 32.592000"
+    Prueba los primeros `num_patterns` patrones de HYPERVOLUME_PATTERNS en orden y
+    devuelve (prioridad, valor) del primero que da un número válido.
     """
-    # Patrones para buscar el hipervolumen
-    patterns = [
-        r'Hipervolumen calculado:\s*([\d.]+)',
-        r'✓ Hipervolumen calculado:\s*([\d.]+)',
-        r'hypervolume[:\s]+([\d.]+)',
-        r'HV[:\s]+([\d.]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, output, re.IGNORECASE)
+    for priority, pattern in enumerate(HYPERVOLUME_PATTERNS[:num_patterns]):
+        match = pattern.search(output)
         if match:
             try:
-                return float(match.group(1))
+                return priority, float(match.group(1))
             except ValueError:
                 continue
     
     return None
 
 
-def extract_hypervolume_from_csv(expected_line_count: int) -> Optional[float]:
+def extract_hypervolume_from_output(output: bytes) -> Optional[float]:
     """
-    Intenta extraer el hipervolumen del archivo CSV de estadísticas.
-    Lee el último registro del archivo de estadísticas que corresponde a la ejecución actual.
+    Extrae el valor del hipervolumen de la salida del programa Java.
     
-    Args:
-        expected_line_count: Número de líneas esperadas en el CSV (incluyendo header)
+    Busca líneas como:
+    - "✓ Hipervolumen calculado: 32.592000"
+    - "Hipervolumen calculado: 32.592000"
+    """
+    found = match_hypervolume(output, len(HYPERVOLUME_PATTERNS))
+    return found[1] if found is not None else None
+
+
+def extract_hypervolume_from_csv(stats_file: Path) -> Optional[float]:
+    """
+    Intenta extraer el hipervolumen del archivo CSV de estadísticas de la réplica.
+    Lee el último registro del archivo, que corresponde a la ejecución actual.
     """
-    stats_file = OUTPUT_DIR / f"{INSTANCE_NAME}_hypervolume_stats.csv"
-    
     if not stats_file.exists():
         return None
     
     try:
-        # Leer el archivo CSV y obtener el último registro
-        with open(stats_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-            
-            # Si el archivo tiene el número esperado de registros, tomar el último
-            if len(rows) >= expected_line_count:
-                last_row = rows[-1]
-                if 'HV' in last_row:
-                    return float(last_row['HV'])
-            elif len(rows) > 0:
-                # Si hay menos registros de los esperados, tomar el último disponible
-                last_row = rows[-1]
-                if 'HV' in last_row:
-                    return float(last_row['HV'])
+        # Leer solo el final del archivo: el registro de la ejecución actual es el último
+        header, last_row = read_last_row(stats_file)
+        if 'HV' in header:
+            return float(last_row[header.index('HV')])
     except Exception as e:
         print(f"  ⚠ Error leyendo CSV: {e}")
     
     return None
 
 
-def save_results(hypervolumes: List[float], seeds: List[int], output_file: str):
+def replicate_worker(tasks: queue.Queue, results: List[Tuple[int, int, Optional[float]]], cpus: str):
+    """
+    Hilo con una JVM persistente (MainLoop) que atiende réplicas de la cola hasta
+    recibir None; la JVM ya calentada por el JIT se reutiliza entre réplicas
+    (JavaDriver la relanza si terminó por timeout o error fatal).
+    Agrega (réplica, semilla, hipervolumen) a `results` (None si la réplica falló).
+    """
+    driver = JavaDriver(cpus, capture_stderr=True)
+    try:
+        while (task := tasks.get()) is not None:
+            replicate_num, seed = task
+            hypervolume = run_java_experiment(driver, seed, replicate_num, NUM_REPLICATES)
+            results.append((replicate_num, seed, hypervolume))
+    finally:
+        driver.close()
+
+
+def save_results(results: List[Tuple[int, int, float]], output_file: str):
     """
     Guarda los resultados en un archivo CSV.
     
     Args:
-        hypervolumes: Lista de valores de hipervolumen
-        seeds: Lista de semillas correspondientes
+        results: Tuplas (réplica, semilla, hipervolumen) de las réplicas exitosas
         output_file: Nombre del archivo de salida
     """
-    OUTPUT_DIR.mkdir(exist_ok=True)
+    # Cada hipervolumen viaja con su réplica y semilla: ordenar no puede desalinearlos
+    results = sorted(results, key=itemgetter(0))
+    hypervolumes = [hv for _, _, hv in results]
     output_path = OUTPUT_DIR / output_file
     
     with open(output_path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(['Replica', 'Seed', 'Hypervolume'])
         
-        for i, (seed, hv) in enumerate(zip(seeds, hypervolumes), 1):
-            writer.writerow([i, seed, f"{hv:.6f}"])
+        writer.writerows((replicate_num, seed, "%.6f" % hv) for replicate_num, seed, hv in results)
     
     print(f"\n💾 Resultados guardados en: {output_path}")
     
@@ -212,27 +256,41 @@ def main():
     print(f"  - Número de réplicas: {NUM_REPLICATES}")
     print()
     
-    hypervolumes = []
-    seeds = []
-    failed_replicates = []
+    # Crear el directorio de salida una sola vez (también si falta output/ o sus padres)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    
+    # Compilar una sola vez antes de todas las réplicas
+    if not prepare_classpath():
+        print("❌ ERROR: No se pudo compilar el proyecto ni obtener el classpath.")
+        sys.exit(1)
     
     start_time = time.time()
     
     # Generar semillas: usar números consecutivos empezando desde 1
     # Esto asegura reproducibilidad
+    num_workers = min(MAX_WORKERS, NUM_REPLICATES)
+    tasks = queue.Queue()
     for replicate_num in range(1, NUM_REPLICATES + 1):
-        seed = replicate_num  # Usar el número de réplica como semilla
-        
-        hypervolume = run_java_experiment(seed, replicate_num, NUM_REPLICATES)
-        
-        if hypervolume is not None:
-            hypervolumes.append(hypervolume)
-            seeds.append(seed)
-        else:
-            failed_replicates.append(replicate_num)
-        
-        # Pequeña pausa entre ejecuciones para evitar problemas
-        time.sleep(0.5)
+        tasks.put((replicate_num, replicate_num))  # Usar el número de réplica como semilla
+    for _ in range(num_workers):
+        tasks.put(None)  # un centinela por worker
+    
+    # Un hilo por JVM persistente, cada una fijada a su propio conjunto de CPUs
+    print(f"Workers (JVM persistentes): {num_workers}")
+    results = []
+    workers = [threading.Thread(target=replicate_worker, args=(tasks, results, cpus))
+               for cpus in worker_cpu_sets(num_workers)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    
+    # Dejar los frentes, estadísticas y asignaciones en los archivos de la instancia
+    # (en orden de réplica), como los dejaba la ejecución en serie
+    merge_run_outputs(INSTANCE_NAME, [f"seed{seed}" for seed in range(1, NUM_REPLICATES + 1)])
+    
+    successful = [result for result in results if result[2] is not None]
+    failed_replicates = sorted(replicate_num for replicate_num, _, hv in results if hv is None)
     
     elapsed_time = time.time() - start_time
     
@@ -240,19 +298,19 @@ def main():
     print(f"RESUMEN DE EJECUCIÓN")
     print(f"{'='*80}")
     print(f"Tiempo total: {elapsed_time/60:.2f} minutos")
-    print(f"Réplicas exitosas: {len(hypervolumes)}/{NUM_REPLICATES}")
+    print(f"Réplicas exitosas: {len(successful)}/{NUM_REPLICATES}")
     
     if failed_replicates:
         print(f"Réplicas fallidas: {failed_replicates}")
     
-    if not hypervolumes:
+    if not successful:
         print("\n❌ ERROR: No se obtuvieron hipervolúmenes de ninguna réplica.")
         print("   Verifica que el programa Java se ejecute correctamente.")
         sys.exit(1)
     
     # Guardar resultados
     output_file = f"{INSTANCE_NAME}_hypervolumes_normality_test.csv"
-    save_results(hypervolumes, seeds, output_file)
+    save_results(successful, output_file)
     
     print(f"\n{'='*80}")
     print(f"✅ RECOPILACIÓN COMPLETADA")
@@ -19,6 +19,7 @@ import org.uma.jmetal.util.evaluator.impl.SequentialSolutionListEvaluator;
 
 import java.io.IOException;
 import java.util.Comparator;
+import java.util.Locale;
 import java.util.List;
 import java.util.ArrayList;
 
@@ -30,7 +31,10 @@ public class Main {
         int populationSize = args.length > 1 ? Integer.parseInt(args[1]) : 100;
         double crossoverProbability = args.length > 2 ? Double.parseDouble(args[2]) : 0.8;
         double mutationProbability = args.length > 3 ? Double.parseDouble(args[3]) : 0.001;
-        Long randomSeed = args.length > 4 ? Long.parseLong(args[4]) : null;
+        // "-" como semilla = sin semilla fija (permite pasar solo el identificador de ejecución)
+        Long randomSeed = args.length > 4 && !args[4].equals("-") ? Long.parseLong(args[4]) : null;
+        // Identificador de ejecución: nombres de salida fijos en lugar de marca de tiempo
+        String runId = args.length > 5 ? args[5] : null;
 
         instance = InstanceLoader.loadFromResources(instanceName);
 
@@ -125,20 +129,29 @@ public class Main {
             }
         }
 
-        decoder.exportToCSV(greedySolution, "output/" + instanceName + "_greedy");
+        // Con runId cada ejecución escribe sus propios archivos: varias JVM (réplicas en
+        // paralelo) nunca escriben ni agregan filas al mismo archivo
+        String runSuffix = runId != null ? "_" + runId : "";
+
+        decoder.exportToCSV(greedySolution, "output/" + instanceName + "_greedy" + runSuffix);
 
         if (bestNSGAII != null) {
-            decoder.exportToCSV(bestNSGAII, "output/" + instanceName + "_nsga2");
+            decoder.exportToCSV(bestNSGAII, "output/" + instanceName + "_nsga2" + runSuffix);
         }
 
         String telemetryBasePath = "output/" + instanceName + "_evolucion";
-        tracker.saveToCsv(telemetryBasePath);
+        if (runId != null) {
+            tracker.saveToCsvFile(telemetryBasePath + "_" + runId + ".csv");
+        } else {
+            tracker.saveToCsv(telemetryBasePath);
+        }
 
         List<IntegerSolution> solutionsToExport = !feasibleSolutions.isEmpty()
                 ? feasibleSolutions
                 : population;
         int instanceSize = instance.getSubjects().size();
-        exportParetoFront(solutionsToExport, "output/" + instanceName + "_pareto_front.csv",
+        String paretoFilePath = "output/" + instanceName + "_pareto_front" + runSuffix + ".csv";
+        exportParetoFront(solutionsToExport, paretoFilePath, runId,
                 instanceName, instanceSize, populationSize,
                 crossoverProbability, mutationProbability);
 
@@ -190,19 +203,21 @@ public class Main {
         return true;
     }
 
-    private static void exportParetoFront(List<IntegerSolution> population, String filePath,
+    private static void exportParetoFront(List<IntegerSolution> population, String filePath, String runId,
                                           String instanceName, int instanceSize, int populationSize,
                                           double crossoverProb, double mutationProb) throws IOException {
         new java.io.File("output").mkdirs();
 
         List<IntegerSolution> solutionsForHV = new ArrayList<>();
 
+        // Con runId el archivo es de esta ejecución: se reescribe en lugar de acumular frentes
+        boolean append = runId == null;
         java.io.File file = new java.io.File(filePath);
-        boolean fileExists = file.exists();
+        boolean writeHeader = !append || !file.exists();
 
         try (java.io.PrintWriter writer = new java.io.PrintWriter(
-                new java.io.FileWriter(filePath, true))) { // append mode
-            if (!fileExists) {
+                new java.io.FileWriter(filePath, append))) {
+            if (writeHeader) {
                 writer.println("f1,f2");
             }
 
@@ -231,8 +246,11 @@ public class Main {
             }
         }
 
+        // Línea que leen los scripts de réplicas (run_normality_test.py); punto decimal fijo
+        System.out.println(String.format(Locale.ROOT, "✓ Hipervolumen calculado: %.6f", hypervolume));
+
         saveHypervolumeStatistics(instanceName, instanceSize, populationSize, crossoverProb, mutationProb,
-                hypervolume, filePath);
+                hypervolume, filePath, runId);
 
     }
 
@@ -336,19 +354,23 @@ public class Main {
 
     /**
      * Guarda las estadísticas de hipervolumen en un archivo CSV.
+     * Sin runId se agregan al archivo acumulado de la instancia; con runId se escribe
+     * un archivo propio de la ejecución ({instancia}_hypervolume_stats_{runId}.csv).
      */
     private static void saveHypervolumeStatistics(String instanceName, int instanceSize, int populationSize,
             double crossoverProb, double mutationProb,
-            double hypervolume, String paretoFilePath) throws IOException {
-        String statsFilePath = "output/" + instanceName + "_hypervolume_stats.csv";
+            double hypervolume, String paretoFilePath, String runId) throws IOException {
+        boolean append = runId == null;
+        String statsFilePath = "output/" + instanceName + "_hypervolume_stats"
+                + (runId != null ? "_" + runId : "") + ".csv";
         java.io.File statsFile = new java.io.File(statsFilePath);
 
-        boolean fileExists = statsFile.exists();
+        boolean writeHeader = !append || !statsFile.exists();
 
         try (java.io.PrintWriter writer = new java.io.PrintWriter(
-                new java.io.FileWriter(statsFilePath, true))) { // append mode
+                new java.io.FileWriter(statsFilePath, append))) {
 
-            if (!fileExists) {
+            if (writeHeader) {
                 writer.println("INSTANCIA,TAM,POB,CRU,MUT,HV,PARETO_FILE");
             }
 
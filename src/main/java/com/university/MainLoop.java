@@ -0,0 +1,56 @@
+package com.university;
+
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.nio.charset.StandardCharsets;
+
+/**
+ * Driver persistente: lee una línea de argumentos por experimento desde stdin
+ * ("instancia poblacion cruzamiento mutacion [semilla|-] [runId]") y ejecuta Main.main con ellos.
+ * Al terminar cada experimento imprime "DONE <rc>" (0 = éxito, 1 = error; si hubo error,
+ * seguido del mensaje de la excepción en la misma línea), de modo que una misma JVM
+ * (ya calentada por el JIT) atiende todas las ejecuciones.
+ * Con el argumento "--stderr-marker" además escribe STDERR_MARKER en stderr antes de cada
+ * "DONE", para que quien lee stderr sepa dónde termina lo escrito por cada ejecución.
+ */
+public class MainLoop {
+
+    public static final String DONE_SENTINEL = "DONE";
+    public static final String STDERR_MARKER = "--- MainLoop: fin de ejecucion ---";
+
+    public static void main(String[] args) throws IOException {
+        boolean stderrMarker = args.length > 0 && args[0].equals("--stderr-marker");
+        BufferedReader reader = new BufferedReader(
+                new InputStreamReader(System.in, StandardCharsets.UTF_8));
+
+        String line;
+        while ((line = reader.readLine()) != null) {
+            line = line.trim();
+            if (line.isEmpty()) {
+                continue;
+            }
+
+            int rc = 0;
+            String error = null;
+            try {
+                Main.main(line.split("\\s+"));
+            } catch (Exception | OutOfMemoryError | StackOverflowError e) {
+                // OOM/StackOverflow de una ejecución: su heap y su pila se liberan al salir,
+                // la JVM puede seguir con la siguiente (si muere, el driver Python la relanza)
+                System.err.println("Error en la ejecución '" + line + "': " + e.getMessage());
+                e.printStackTrace();
+                rc = 1;
+                // El mensaje viaja en la línea DONE: una sola línea, sin saltos
+                error = e.toString().replaceAll("\\s+", " ").trim();
+            }
+
+            if (stderrMarker) {
+                System.err.println(STDERR_MARKER);
+                System.err.flush();
+            }
+            System.out.println(DONE_SENTINEL + " " + rc + (error != null ? " " + error : ""));
+            System.out.flush();
+        }
+    }
+}
@@ -190,8 +190,13 @@ public class EvolutionTracker {
 
     public void saveToCsv(String baseFileName) {
         String dateTime = LocalDateTime.now().format(DateTimeFormatter.ofPattern("yyyy-MM-dd_HH-mm-ss"));
-        String fileName = baseFileName + "_" + dateTime + ".csv";
+        saveToCsvFile(baseFileName + "_" + dateTime + ".csv");
+    }
 
+    /**
+     * Guarda la historia en un archivo con nombre fijo (sin marca de tiempo).
+     */
+    public void saveToCsvFile(String fileName) {
         try {
             Files.createDirectories(Paths.get(fileName).getParent());
         } catch (IOException e) {